@@ -5,6 +5,8 @@ import os       # Read .env
 import uuid     # Create unique ID
 import secrets # Short token
 
+from profiling import timed  # Per-request profiling timers
+
 # JWT basic setting
 # Read secret key from .env, or use default 
 JWT_SECRET = os.getenv('JWT_SECRET', 'change-me-in-prod')
@@ -13,12 +15,14 @@ TOKEN_EXPIRE_MINUTES = 60   # limit token time for 60 minutes
 
 def hash_password(password: str) -> str:
     """Hash password for secure storage"""
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    with timed("bcrypt"):
+        salt = bcrypt.gensalt()
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     """Check if the password is correct"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')) # Returns True if match
+    with timed("bcrypt"):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')) # Returns True if match
 
 def create_token(user_id: int, email: str, name: str) -> str:
     """
@@ -35,12 +39,14 @@ def create_token(user_id: int, email: str, name: str) -> str:
         'jti': jti,  # Unique token ID for logout
         'exp': expiration
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    with timed("jwt"):
+        return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def decode_token(token: str) -> dict:
     """Read and verify token"""
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        with timed("jwt"):
+            return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise Exception('Token expired')
     except jwt.InvalidTokenError:
@@ -4,9 +4,13 @@ from dotenv import load_dotenv
 from datetime import datetime, timezone
 import os
 
-from database import init_db, get_db, add_to_db
+from database import init_db, get_db, add_to_db, engine
 from models import User, BlacklistedToken
 from auth import hash_password, decode_token, verify_password, create_token, create_short_token
+from stats import (record_signup, record_login, record_user_deleted, record_revocation,
+                   record_pruned, prune_counters, seed_counters, dashboard_stats)
+from profiling import (init_profiling, set_profiling, slowest_requests, write_profiles, sample_counts,
+                       settings as profile_settings)
 
 load_dotenv()
 app = Flask(__name__)
@@ -20,11 +24,15 @@ CORS(app, resources={
     }
 })
 
+# Opt-in request profiling (PROFILE_ENABLED / PROFILE_SAMPLE_RATE in .env)
+init_profiling(app, engine)
+
 
 # Add token jti to blacklist until expiration
 def _blacklist_token(db, jti: str, exp_ts: int):
     expires_at = datetime.fromtimestamp(exp_ts, tz=timezone.utc)
     db.add(BlacklistedToken(jti=jti, expires_at=expires_at))
+    record_revocation(db)
     db.commit()
 
 
@@ -36,7 +44,8 @@ def _is_blacklisted(db, jti: str) -> bool:
 # Delete expired blacklist rows
 def _prune_blacklist(db):
     now = datetime.now(timezone.utc)
-    db.query(BlacklistedToken).filter(BlacklistedToken.expires_at < now).delete()
+    pruned = db.query(BlacklistedToken).filter(BlacklistedToken.expires_at < now).delete()
+    record_pruned(db, pruned)
     db.commit()
 
 
@@ -44,8 +53,10 @@ def _prune_blacklist(db):
 init_db()
 
 
-# Prune expired tokens once at startup
+# Seed dashboard counters, drop old buckets and prune expired tokens once at startup
 with get_db() as db:
+    seed_counters(db)
+    prune_counters(db)
     _prune_blacklist(db)
 
 
@@ -81,6 +92,7 @@ def register():
         short_token = create_short_token(12)
         
         new_user = User(email=email, name=name, password_hash=hashed, short_token=short_token)
+        record_signup(db)
         add_to_db(db, new_user)
 
     return jsonify({
@@ -119,12 +131,17 @@ def login():
         
         # create token
         token = create_token(user.id, user.email, user.name)
+        user_id, short_token = user.id, user.short_token
+
+        # Count the login (commit expires `user`, so its fields are read above)
+        record_login(db)
+        db.commit()
 
     # return success + token
     return jsonify({
         "token": token,
-        "user_id": user.id,
-        "short_token": user.short_token,
+        "user_id": user_id,
+        "short_token": short_token,
         "message": "Login Successful",
     }), 200
 
@@ -195,6 +212,7 @@ def delete_account():
         
         user = db.query(User).filter(User.id == info['user_id']).first()
         db.delete(user)
+        record_user_deleted(db)
         db.commit()
     
     return jsonify({
@@ -311,7 +329,7 @@ def adminPannel(access_code):
         access_code (string): The access code for your program
         view_name (string): the name of the view you want to enter
                             in the admin pannel
-            Options: [
+            Options: [users, blacklist, add_user, profiling, dashboard]
     
     Returns:
         if all arguments are correct / provided:
@@ -331,23 +349,72 @@ def adminPannel(access_code):
             data = db.query(User).all()  # All email logs
             return render_template("admin-usersView.html", auth_data=data, access_code=access_code)
         elif view == "blacklist":
-            data = db.query(BlacklistedToken).all()  # All email logs
+            # valid is computed by the database instead of per row in Python
             now = datetime.now(timezone.utc)
-            enriched = []
-            for t in data:
-                expires_at = t.expires_at
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-                enriched.append({
-                    "id": t.id,
-                    "jti": t.jti,
-                    "created_at": t.created_at,
-                    "expires_at": expires_at,
-                    "valid": expires_at > now
-                })
-            return render_template("admin-blacklistView.html",blacklist_data=enriched,access_code=access_code)
+            data = db.query(
+                BlacklistedToken.id,
+                BlacklistedToken.jti,
+                BlacklistedToken.created_at,
+                BlacklistedToken.expires_at,
+                (BlacklistedToken.expires_at > now).label("valid")
+            ).all()
+            return render_template("admin-blacklistView.html",blacklist_data=data,access_code=access_code)
         elif view == "add_user":
             return render_template("admin-addUser.html", access_code=access_code)
+        elif view == "profiling":
+            return render_template("admin-profilingView.html",
+                                   profile_data=slowest_requests(),
+                                   profile_settings=profile_settings,
+                                   sample_counts=sample_counts,
+                                   access_code=access_code)
+        elif view == "dashboard":
+            return render_template("admin-dashboardView.html",
+                                   stats=dashboard_stats(db),
+                                   access_code=access_code)
+
+
+@app.route("/admin/<access_code>/stats", methods=["GET"])
+def adminStats(access_code):
+    """ Returns the dashboard statistics as JSON
+
+    Args:
+        access_code (string): The access code for your program
+
+    Returns:
+        if access_code is valid:
+            200 {total_users, revocations, signups_per_day, logins_per_hour, generated_at}
+        if access_code isn't valid:
+            401 {error}
+    """
+    if access_code != adminCode:
+        return jsonify({"error": "Invalid access code"}), 401
+    with get_db() as db:
+        return jsonify(dashboard_stats(db)), 200
+
+
+@app.route("/admin/<access_code>/profiling", methods=["POST"])
+def updateProfiling(access_code):
+    """ Updates the profiling settings from the admin pannel
+
+    Args:
+        access_code (string): The access code for your program
+        enabled (form field): "on" if profiling should be enabled
+        sample_rate (form field): fraction of requests to profile (0 - 1)
+        write_profiles (form field): present to write the profiles to disk now
+
+    Returns:
+        if access_code is valid:
+            redirect to /admin/<access_code>?view=profiling
+        if access_code isn't valid:
+            redirect to "/"
+    """
+    if access_code != adminCode:
+        return redirect(url_for("index"))
+    if "write_profiles" in request.form:
+        write_profiles()
+    else:
+        set_profiling(request.form.get("enabled") == "on", request.form.get("sample_rate"))
+    return redirect(url_for("adminPannel", access_code=access_code, view="profiling"))
 
 
 if __name__ == '__main__':
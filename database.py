@@ -39,8 +39,11 @@ SessionLocal = sessionmaker(
 )
 
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables (and indexes added to existing tables)"""
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 @contextmanager
@@ -24,7 +24,18 @@ class BlacklistedToken(Base):
     __tablename__ = "blacklisted_tokens"
     id = Column(Integer, primary_key=True)
     jti = Column(String(64), unique=True, nullable=False, index=True)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     __table_args__ = (UniqueConstraint('jti', name='uq_blacklist_jti'),)
+
+
+class StatCounter(Base):
+    """Incrementally maintained counters for the admin dashboard"""
+    __tablename__ = "stat_counters"
+    id = Column(Integer, primary_key=True)
+    metric = Column(String(32), nullable=False)
+    bucket = Column(String(16), nullable=False, default="")  # "" for totals, day or hour otherwise
+    value = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint('metric', 'bucket', name='uq_stat_metric_bucket'),)
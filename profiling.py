@@ -0,0 +1,206 @@
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from contextlib import contextmanager
+from collections import deque
+from datetime import datetime, timezone
+from time import perf_counter
+import cProfile
+import pstats
+import marshal
+import random
+import math
+import threading
+import os
+
+# ------------------------
+#   PROFILING SETTINGS
+# ------------------------
+
+# Path setup (profiles live next to the database in data/)
+basedir = os.path.abspath(os.path.dirname(__file__))
+parent_dir = os.path.dirname(basedir)
+default_profile_dir = os.path.join(parent_dir, "data", "profiles")
+
+
+def _parse_sample_rate(value, default: float) -> float:
+    """Convert `value` to a sample rate in [0, 1], or return `default` if it isn't a finite number"""
+    try:
+        rate = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(rate):
+        return default
+    return min(max(rate, 0.0), 1.0)
+
+
+# Runtime settings, seeded from .env and editable from the admin pannel
+settings = {
+    "enabled": os.getenv("PROFILE_ENABLED", "false").lower() in ("1", "true", "yes"),
+    "sample_rate": _parse_sample_rate(os.getenv("PROFILE_SAMPLE_RATE"), 0.1),
+    "profile_dir": os.getenv("PROFILE_DIR", default_profile_dir),
+}
+
+CATEGORIES = ("db", "bcrypt", "jwt")
+RECENT_LIMIT = 200   # Number of sampled requests kept in memory
+WRITE_INTERVAL = 30  # Minimum seconds between writing profiles to disk
+
+_lock = threading.Lock()            # Guards the aggregated stats + recent list
+_profiler_lock = threading.Lock()   # Only one cProfile can be active at a time
+_write_lock = threading.Lock()      # Only one thread writes profiles at a time
+_route_stats = {}                   # endpoint -> aggregated pstats.Stats
+_unwritten = set()                  # endpoints with samples not yet on disk
+_last_write = float("-inf")         # perf_counter() of the last write (first sample writes at once)
+_recent = deque(maxlen=RECENT_LIMIT)
+
+# Picked samples that were profiled vs skipped because another request held the profiler
+sample_counts = {"profiled": 0, "skipped": 0}
+
+
+def set_profiling(enabled: bool, sample_rate):
+    """Update profiling settings at runtime (invalid sample rates keep the current one)"""
+    settings["enabled"] = bool(enabled)
+    settings["sample_rate"] = _parse_sample_rate(sample_rate, settings["sample_rate"])
+
+
+def _is_sampled() -> bool:
+    """Check if the current request is being profiled"""
+    return has_request_context() and g.get("_profile") is not None
+
+
+@contextmanager
+def timed(category: str):
+    """
+    Add the time spent in the block to `category` for the current request.
+    Does nothing unless the request was picked for profiling.
+    """
+    if not _is_sampled():
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        g._profile_timings[category] += perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _is_sampled():
+        context._profile_query_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_profile_query_start", None)
+    if start is not None and _is_sampled():
+        g._profile_timings["db"] += perf_counter() - start
+
+
+def _start_profile():
+    """Pick requests to sample and start the profiler"""
+    if not settings["enabled"] or request.endpoint == "static":
+        return
+    if random.random() >= settings["sample_rate"]:
+        return
+    if not _profiler_lock.acquire(blocking=False):
+        # Another request is already being profiled
+        with _lock:
+            sample_counts["skipped"] += 1
+        return
+
+    g._profile_timings = {category: 0.0 for category in CATEGORIES}
+    g._profile_status = 500
+    g._profile_start = perf_counter()
+    g._profile = cProfile.Profile()
+    g._profile.enable()
+
+
+def _capture_status(response):
+    if _is_sampled():
+        g._profile_status = response.status_code
+    return response
+
+
+def _finish_profile(exc):
+    """Stop the profiler, aggregate stats per route and record the request"""
+    if not _is_sampled():
+        return
+    profiler = g._profile
+    g._profile = None
+    profiler.disable()
+    duration = perf_counter() - g._profile_start
+    _profiler_lock.release()
+
+    endpoint = request.endpoint or "unknown"
+    timings = g._profile_timings
+    record = {
+        "endpoint": endpoint,
+        "method": request.method,
+        "path": request.path,
+        "status": g._profile_status,
+        "duration_ms": duration * 1000,
+        "db_ms": timings["db"] * 1000,
+        "bcrypt_ms": timings["bcrypt"] * 1000,
+        "jwt_ms": timings["jwt"] * 1000,
+        "other_ms": max(duration - sum(timings.values()), 0.0) * 1000,
+        "timestamp": datetime.now(timezone.utc),
+    }
+
+    stats = pstats.Stats(profiler)
+    with _lock:
+        if endpoint in _route_stats:
+            _route_stats[endpoint].add(stats)
+        else:
+            _route_stats[endpoint] = stats
+        _unwritten.add(endpoint)
+        _recent.append(record)
+        sample_counts["profiled"] += 1
+
+    if perf_counter() - _last_write >= WRITE_INTERVAL:
+        write_profiles()
+
+
+def write_profiles():
+    """
+    Write the aggregated profiles with new samples to <profile_dir>/<endpoint>.prof.
+    Stats are copied under the lock and written outside of it.
+    """
+    global _last_write
+    if not _write_lock.acquire(blocking=False):
+        return  # Another thread is already writing
+    try:
+        with _lock:
+            # Values are tuples replaced (not mutated) by Stats.add, so a shallow copy is enough
+            snapshot = {endpoint: dict(_route_stats[endpoint].stats) for endpoint in _unwritten}
+            _unwritten.clear()
+            _last_write = perf_counter()
+        if snapshot:
+            os.makedirs(settings["profile_dir"], exist_ok=True)
+        for endpoint, data in snapshot.items():
+            with open(os.path.join(settings["profile_dir"], f"{endpoint}.prof"), "wb") as f:
+                marshal.dump(data, f)  # Same format as pstats.Stats.dump_stats
+    finally:
+        _write_lock.release()
+
+
+def slowest_requests(limit: int = 25) -> list:
+    """Return the slowest of the recently sampled requests"""
+    with _lock:
+        records = list(_recent)
+    return sorted(records, key=lambda r: r["duration_ms"], reverse=True)[:limit]
+
+
+def init_profiling(app, engine):
+    """
+    Register the request hooks and database timers.
+    Sampled requests are profiled with cProfile and written to
+    <profile_dir>/<endpoint>.prof at most every WRITE_INTERVAL seconds
+    (open with `python -m pstats` or snakeviz).
+
+    Only one request is profiled at a time, so a sampled request that overlaps
+    one already being profiled is skipped (counted in sample_counts["skipped"]).
+    Under concurrent load the real rate is below sample_rate.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start_profile)
+    app.after_request(_capture_status)
+    app.teardown_request(_finish_profile)
@@ -0,0 +1,135 @@
+from sqlalchemy import update, func
+from datetime import datetime, timezone, timedelta
+
+from models import User, BlacklistedToken, StatCounter
+
+# ------------------------
+#   DASHBOARD COUNTERS
+# ------------------------
+# Counters are updated in the same transaction as the change they track,
+# so the dashboard only reads a bounded number of rows.
+
+DAY_FORMAT = "%Y-%m-%d"
+HOUR_FORMAT = "%Y-%m-%dT%H"
+DAYS = 14   # Days of signups kept and shown
+HOURS = 24  # Hours of logins kept and shown
+TOTALS = ("users", "revocations_active", "revocations_expired")
+
+
+def _bump(db, metric: str, amount: int = 1, bucket: str = ""):
+    """Add `amount` to a counter (does not commit)"""
+    updated = db.execute(
+        update(StatCounter)
+        .where(StatCounter.metric == metric, StatCounter.bucket == bucket)
+        .values(value=StatCounter.value + amount)
+    ).rowcount
+    if not updated:
+        db.add(StatCounter(metric=metric, bucket=bucket, value=amount))
+        db.flush()
+
+
+def _get(db, metric: str, bucket: str = ""):
+    """Return a counter row, or None if it was never created"""
+    return db.query(StatCounter).filter(StatCounter.metric == metric, StatCounter.bucket == bucket).first()
+
+
+def record_signup(db):
+    now = datetime.now(timezone.utc)
+    _bump(db, "users")
+    _bump(db, "signups", bucket=now.strftime(DAY_FORMAT))
+
+
+def record_user_deleted(db):
+    _bump(db, "users", -1)
+
+
+def record_login(db):
+    now = datetime.now(timezone.utc)
+    _bump(db, "logins", bucket=now.strftime(HOUR_FORMAT))
+
+
+def record_revocation(db):
+    _bump(db, "revocations_active")
+
+
+def record_pruned(db, count: int):
+    """Move pruned blacklist rows from active to expired"""
+    if count:
+        _bump(db, "revocations_active", -count)
+        _bump(db, "revocations_expired", count)
+
+
+def _day_buckets(now, days: int = DAYS) -> list:
+    return [(now - timedelta(days=i)).strftime(DAY_FORMAT) for i in reversed(range(days))]
+
+
+def _hour_buckets(now, hours: int = HOURS) -> list:
+    return [(now - timedelta(hours=i)).strftime(HOUR_FORMAT) for i in reversed(range(hours))]
+
+
+def prune_counters(db):
+    """Delete signup / login buckets older than the dashboard window (does not commit)"""
+    now = datetime.now(timezone.utc)
+    db.query(StatCounter).filter(
+        StatCounter.metric == "signups", StatCounter.bucket < _day_buckets(now)[0]
+    ).delete(synchronize_session=False)
+    db.query(StatCounter).filter(
+        StatCounter.metric == "logins", StatCounter.bucket < _hour_buckets(now)[0]
+    ).delete(synchronize_session=False)
+
+
+def seed_counters(db):
+    """
+    Create the total counters from the existing tables.
+    Only scans the tables the first time (databases created before the counters).
+    """
+    if _get(db, "users") is None:
+        _bump(db, "users", db.query(func.count(User.id)).scalar())
+        signups = db.query(func.date(User.created_at), func.count(User.id)).group_by(func.date(User.created_at)).all()
+        for day, count in signups:
+            if day is not None:
+                _bump(db, "signups", count, bucket=str(day))
+    if _get(db, "revocations_active") is None:
+        _bump(db, "revocations_active", db.query(func.count(BlacklistedToken.id)).scalar())
+    db.commit()
+
+
+def _series(db, metric: str, buckets: list) -> dict:
+    """Read one bucketed counter series with an index range lookup"""
+    rows = db.query(StatCounter.bucket, StatCounter.value).filter(
+        StatCounter.metric == metric, StatCounter.bucket >= buckets[0]
+    ).all()
+    return dict(rows)
+
+
+def dashboard_stats(db) -> dict:
+    """
+    Read the dashboard statistics from the counters (read only).
+    Every query is an index lookup on a bounded number of rows.
+
+    Returns:
+        dict: totals, revocations, signups_per_day and logins_per_hour
+    """
+    now = datetime.now(timezone.utc)
+    day_buckets = _day_buckets(now)
+    hour_buckets = _hour_buckets(now)
+
+    totals = dict(db.query(StatCounter.metric, StatCounter.value).filter(
+        StatCounter.metric.in_(TOTALS), StatCounter.bucket == ""
+    ).all())
+    signups = _series(db, "signups", day_buckets)
+    logins = _series(db, "logins", hour_buckets)
+
+    # Expired tokens still waiting to be pruned (index range on expires_at)
+    unpruned = db.query(func.count(BlacklistedToken.id)).filter(BlacklistedToken.expires_at < now).scalar()
+
+    return {
+        "total_users": totals.get("users", 0),
+        "revocations": {
+            "active": totals.get("revocations_active", 0) - unpruned,
+            "expired": totals.get("revocations_expired", 0) + unpruned,
+        },
+        "signups_per_day": [{"day": d, "count": signups.get(d, 0)} for d in day_buckets],
+        "logins_per_hour": [{"hour": h, "count": logins.get(h, 0)} for h in hour_buckets],
+        "generated_at": now.isoformat(),
+    }
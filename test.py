@@ -11,6 +11,8 @@ Covers end-to-end HTTP communication with the running microservice:
 - Exists (availability + errors)
 - User by short token (happy + 404)
 - Delete account flow (happy + follow-up failures)
+- Admin stats counters follow register / login / logout / delete (admin; needs ADMIN_CODE)
+- Profiling tab lists a profiled login (admin; needs ADMIN_CODE)
 
 Run while the service is up:  python auth_app.py  (listens on http://localhost:5001)
 
@@ -18,6 +20,7 @@ Requirements: pip install requests
 """
 
 import os
+import re
 import sys
 import json
 import time
@@ -37,6 +40,7 @@ BASE_URL = os.getenv("AUTH_BASE_URL", "http://localhost:5001")
 DEFAULT_EMAIL = os.getenv("AUTH_TEST_EMAIL", "bob@example.com")
 DEFAULT_PASS  = os.getenv("AUTH_TEST_PASS",  "pass1234")
 DEFAULT_NAME  = os.getenv("AUTH_TEST_NAME",  "Bob")
+ADMIN_CODE    = os.getenv("ADMIN_CODE")  # Admin checks are skipped when unset
 
 TIMEOUT = 10
 
@@ -173,6 +177,75 @@ def run():
     # e) login again -> 401
     _, _ = request_json("POST", f"{BASE_URL}/auth/login", json_body={"email": del_email, "password": "Temp123!"}, expect_status=401)
 
+    # ---------------- Stats (admin) ----------------
+    if ADMIN_CODE:
+        stats_url = f"{BASE_URL}/admin/{ADMIN_CODE}/stats"
+
+        def get_stats():
+            return request_json("GET", stats_url, expect_status=200)[1]
+
+        def last_logins(before, after):
+            """Login count of the current hour before and after (handles an hour rollover)"""
+            b, a = before["logins_per_hour"][-1], after["logins_per_hour"][-1]
+            return (b["count"] if a["hour"] == b["hour"] else 0), a["count"]
+
+        st_email = f"stats+{int(time.time())}@example.com"
+        st_login = {"email": st_email, "password": "Temp123!"}
+
+        p("Stats (register -> total_users +1)")
+        before = get_stats()
+        _, _ = request_json("POST", f"{BASE_URL}/auth/register", json_body={**st_login, "name": "Stats"}, expect_status=201)
+        after = get_stats()
+        assert after["total_users"] == before["total_users"] + 1, "total_users did not go up after register"
+
+        p("Stats (login -> logins this hour +1)")
+        before = after
+        _, st_data = request_json("POST", f"{BASE_URL}/auth/login", json_body=st_login, expect_status=200)
+        after = get_stats()
+        b, a = last_logins(before, after)
+        assert a == b + 1, "logins_per_hour did not go up after login"
+
+        p("Stats (failed login -> logins this hour unchanged)")
+        before = after
+        _, _ = request_json("POST", f"{BASE_URL}/auth/login", json_body={**st_login, "password": "wrongpass"}, expect_status=401)
+        after = get_stats()
+        b, a = last_logins(before, after)
+        assert a == b, "logins_per_hour changed after a failed login"
+
+        p("Stats (logout -> revocations.active +1)")
+        before = after
+        _, _ = request_json("POST", f"{BASE_URL}/auth/logout", headers={"Authorization": f"Bearer {st_data['token']}"}, expect_status=200)
+        after = get_stats()
+        assert after["revocations"]["active"] == before["revocations"]["active"] + 1, "revocations.active did not go up after logout"
+
+        p("Stats (delete-account -> total_users -1)")
+        _, st_data = request_json("POST", f"{BASE_URL}/auth/login", json_body=st_login, expect_status=200)
+        before = get_stats()
+        _, _ = request_json("POST", f"{BASE_URL}/auth/delete-account", headers={"Authorization": f"Bearer {st_data['token']}"}, expect_status=200)
+        after = get_stats()
+        assert after["total_users"] == before["total_users"] - 1, "total_users did not go down after delete-account"
+    else:
+        p("Stats (skipped: ADMIN_CODE not set)")
+
+    # ---------------- Profiling (admin) ----------------
+    if ADMIN_CODE:
+        p("Profiling (sample every request → login → 'login' listed in Profiling tab)")
+        admin_url = f"{BASE_URL}/admin/{ADMIN_CODE}"
+        # Remember the current settings so they can be restored afterwards
+        _, data = request_json("GET", admin_url, params={"view": "profiling"}, expect_status=200)
+        was_enabled = re.search(r'name="enabled"\s+checked', data["_raw"]) is not None
+        old_rate = re.search(r'name="sample_rate" value="([^"]*)"', data["_raw"]).group(1)
+        requests.post(f"{admin_url}/profiling", data={"enabled": "on", "sample_rate": "1"}, timeout=TIMEOUT)
+        try:
+            _, _ = request_json("POST", f"{BASE_URL}/auth/login", json_body={"email": DEFAULT_EMAIL, "password": DEFAULT_PASS}, expect_status=200)
+            _, data = request_json("GET", admin_url, params={"view": "profiling"}, expect_status=200)
+            assert '"login"' in data["_raw"], "Profiled login missing from Profiling tab"
+        finally:
+            restore = {"sample_rate": old_rate, **({"enabled": "on"} if was_enabled else {})}
+            requests.post(f"{admin_url}/profiling", data=restore, timeout=TIMEOUT)
+    else:
+        p("Profiling (skipped: ADMIN_CODE not set)")
+
     print("\n" + "=" * 72)
     print("HTTP COMMUNICATION SUCCESSFULLY DEMONSTRATED")
     print("=" * 72)